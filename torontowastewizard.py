@@ -28,6 +28,15 @@ SITE_NOT_AVAILABLE = "Site not Available"
 TRY_AGAIN = "Try Again"
 OK = "OK"
 
+TORONTO_TZ = tz.gettz("America/Toronto")
+PICKUP_SCHEDULE_URL = "https://www.toronto.ca/ext/open_data/catalog/data_set_files/Pickup_Schedule_2018.csv"
+
+# next pickup per area, precomputed once per container and rolled forward
+# at Toronto midnight
+collection_schedule = {}
+collection_table = {}
+collection_table_date = None
+
 # --------------- Helper functions ---------------------------------------------
 
 def html_to_text(data):
@@ -318,58 +327,134 @@ def build_collected_items(items):
     return collected_items
 
 
-def get_collection_info(collection_area):
+def get_local_dates():
+    """ today and tomorrow in Toronto, DST aware
+    """
+    local_now = datetime.now(TORONTO_TZ)
+    query_date = local_now.date()
+    tomorrow_date = query_date + timedelta(days=1)
+    return query_date, tomorrow_date
 
-    # Assume device timezone is EST
-    utc_now = datetime.utcnow()
-    query_date = (utc_now - timedelta(hours=5)).date()
-    tomorrow_date = (utc_now + timedelta(hours=19)).date()
 
-    # for testing
-    # test_collection_date = (datetime.strptime('Feb 20 2018  1:33PM', '%b %d %Y %I:%M%p')).date()
-    # Feb22_date = (datetime.strptime('Feb 22 2018  1:33PM', '%b %d %Y %I:%M%p')).date()
+def get_schedule_items(row):
+    items = []
+    if row[2] != "0":
+        items.append("green bin")
+    if row[3] != "0":
+        items.append("garbage")
+    if row[4] != "0":
+        items.append("recycling")
+    if row[5] != "0":
+        items.append("yard waste")
+    if row[6] != "0":
+        items.append("christmas tree")
+    return items
+
+
+def load_collection_schedule():
+    """ reads the whole pickup schedule once into
+    {area_name: [(week_starting, items), ...]} sorted by date
+    """
 
     # Get schedule data from Toronto Open Data
     # Solid Waste Daytime Curbside Collection Areas
-    url = "https://www.toronto.ca/ext/open_data/catalog/data_set_files/Pickup_Schedule_2018.csv"
-    request = urllib.request.Request(url)
+    request = urllib.request.Request(PICKUP_SCHEDULE_URL)
 
     try:
         response=urllib.request.urlopen(request)
         contents = csv.reader(codecs.iterdecode(response, 'utf-8'))
+        schedule = {}
+        for row in contents:
+            try:
+                week_starting = (datetime.strptime(row[1], "%m/%d/%y")).date()
+            except (ValueError, IndexError):
+                # header or malformed row
+                continue
+            area_name = row[0].replace(" ", "")
+            schedule.setdefault(area_name, []).append(
+                (week_starting, get_schedule_items(row)))
 
     except Exception as e:
-        return build_collection_response(SITE_NOT_AVAILABLE, SITE_NOT_AVAILABLE)
+        print("error occurred getting pickup schedule {}".format(str(e)))
+        return SITE_NOT_AVAILABLE
 
-    items = []
-    next_collection_date = NOT_FOUND
-    for row in contents:
-        if collection_area in row[0]:
-            week_starting = (datetime.strptime(row[1], "%m/%d/%y")).date()
-            #if week_starting == Feb22_date:
-            #    week_starting = test_collection_date
-            if week_starting >= query_date:
-                next_collection_date = week_starting
-                print("next collection date {}".format(next_collection_date))
-                if row[2] != "0":
-                    items.append("green bin")
-                if row[3] != "0":
-                    items.append("garbage")
-                if row[4] != "0":
-                    items.append("recycling")
-                if row[5] != "0":
-                    items.append("yard waste")
-                if row[6] != "0":
-                    items.append("christmas tree")
-                break
-
-    if next_collection_date == NOT_FOUND:
-        return build_collection_response(NOT_FOUND, NOT_FOUND)
-
-    collected_items = build_collected_items(items)
+    for area_name in schedule:
+        schedule[area_name].sort(key=lambda collection: collection[0])
+
+    print("loaded pickup schedule for {} areas".format(len(schedule)))
+    return schedule
+
+
+def build_collection_entry(index, collections, query_date, tomorrow_date):
+    """ ready-to-speak next pickup for one area, starting at index
+    """
+    if index >= len(collections):
+        return {
+            'index': index,
+            'response': build_collection_response(NOT_FOUND, NOT_FOUND)
+        }
+
+    next_collection_date, items = collections[index]
     date_output = build_collection_date(query_date, tomorrow_date, next_collection_date)
+    return {
+        'index': index,
+        'response': build_collection_response(date_output,
+                                              build_collected_items(items))
+    }
+
+
+def roll_collection_table(query_date, tomorrow_date):
+    """ moves every area forward to its next pickup on or after query_date
+    """
+    global collection_table, collection_table_date
+
+    for area_name, collections in collection_schedule.items():
+        index = 0
+        if area_name in collection_table:
+            index = collection_table[area_name]['index']
+        while index < len(collections) and collections[index][0] < query_date:
+            index += 1
+        collection_table[area_name] = build_collection_entry(
+            index, collections, query_date, tomorrow_date)
+
+    collection_table_date = query_date
+    print("next pickup table rolled to {}".format(query_date))
+
+
+def get_collection_table():
+    """ next pickup for every area, refreshed at Toronto midnight.
+    Kept in module globals so warm Lambda containers reuse it.
+    """
+    global collection_schedule
+
+    if not collection_schedule:
+        schedule = load_collection_schedule()
+        if schedule == SITE_NOT_AVAILABLE:
+            return SITE_NOT_AVAILABLE
+        collection_schedule = schedule
+
+    query_date, tomorrow_date = get_local_dates()
+    if collection_table_date != query_date:
+        roll_collection_table(query_date, tomorrow_date)
+
+    return collection_table
+
+
+def get_collection_info(collection_area):
+
+    table = get_collection_table()
+    if table == SITE_NOT_AVAILABLE:
+        return build_collection_response(SITE_NOT_AVAILABLE, SITE_NOT_AVAILABLE)
+
+    if collection_area in table:
+        return table[collection_area]['response']
+
+    # schedule area names may carry a suffix the shapefile name doesn't
+    for area_name, entry in table.items():
+        if collection_area in area_name:
+            return entry['response']
 
-    return build_collection_response(date_output, collected_items)
+    return build_collection_response(NOT_FOUND, NOT_FOUND)
 
 
 def get_waste_material(intent):